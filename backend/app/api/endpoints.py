@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.services.mindmap_service import mindmap_service
 from app.db import crud
 
@@ -31,7 +31,7 @@ async def add_mind_map(
 @router.get("/export/{node_id}", response_model=dict)
 def export_mind_map(
     node_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Exports a mind map or subgraph to JSON, starting from the given node_id.
@@ -43,7 +43,7 @@ def export_mind_map(
     return exported_map
 
 @router.get("/graph", response_model=dict)
-def get_full_graph(db: Session = Depends(get_db)):
+def get_full_graph(db: Session = Depends(get_read_db)):
     """
     Fetches the entire graph of nodes and links for visualization.
     """
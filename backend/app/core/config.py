@@ -3,14 +3,47 @@ from pydantic_settings import BaseSettings
 from typing import Optional
 
 class Settings(BaseSettings):
-    DATABASE_URL: str
-    OPENAI_API_KEY: str
-    OPENAI_BASE_URL: str
+    # Optional so the app imports without them; they are checked when the
+    # engine or AI clients are first built.
+    DATABASE_URL: Optional[str] = None
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
     MODEL_NAME: str = "DeepSeek-R1"
     EMBEDDING_MODEL_NAME: str = "text-embedding-ada-002"
     EMBEDDING_API_KEY: Optional[str] = None
     API_BASE: Optional[str] = None
 
+    # Connection pool sizing, applied to the primary and every read replica.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    # Comma-separated read-only replica URLs for the heavy read endpoints.
+    # When empty, reads go to DATABASE_URL.
+    DATABASE_READ_URLS: Optional[str] = None
+    # Seconds after a write during which the same client keeps reading from
+    # the primary, so it always sees its own writes. 0 disables this.
+    READ_YOUR_WRITES_WINDOW: float = 5.0
+
+    # Run create_all on startup. Turn off where the schema is managed separately.
+    CREATE_SCHEMA: bool = True
+    # Run the warm-up hooks (cache and index preloading) in the background on startup.
+    WARMUP_ON_STARTUP: bool = True
+
+    # Per-process caches apply change log deltas up to this many rows behind;
+    # beyond that they reload from the database instead.
+    CHANGE_FEED_MAX_DELTA: int = 10000
+    # Name of a shared-memory segment holding a read-only embedding matrix
+    # that all workers on one host attach to. Disabled when empty.
+    EMBEDDING_SHM_NAME: Optional[str] = None
+
+    @property
+    def database_read_urls(self) -> list[str]:
+        if not self.DATABASE_READ_URLS:
+            return []
+        return [url.strip() for url in self.DATABASE_READ_URLS.split(",") if url.strip()]
+
     class Config:
         env_file = ".env"
 
@@ -1,12 +1,45 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from . import models
 import json
 
+# Change log operations, see models.GraphChange.
+NODE_CREATED = "node_created"
+NODE_UPDATED = "node_updated"
+NODE_DELETED = "node_deleted"
+EDGE_CREATED = "edge_created"
+EDGE_UPDATED = "edge_updated"
+
+def _bump_graph_version(db: Session) -> int:
+    """
+    Increments the graph version inside the current transaction and returns
+    the new value. The counter row stays locked until commit.
+    """
+    updated = db.query(models.GraphVersion).filter(models.GraphVersion.id == 1).update(
+        {"version": models.GraphVersion.version + 1}, synchronize_session=False
+    )
+    if not updated:
+        # Tables created before the counter existed have no row yet.
+        db.add(models.GraphVersion(id=1, version=1))
+        db.flush()
+        return 1
+    return db.query(models.GraphVersion.version).filter(models.GraphVersion.id == 1).scalar()
+
+def _record_change(db: Session, op: str, node_id: int = None, related_id: int = None):
+    """
+    Adds a change log row to the current transaction, so it commits together
+    with the mutation it describes.
+    """
+    version = _bump_graph_version(db)
+    db.add(models.GraphChange(version=version, op=op, node_id=node_id, related_id=related_id))
+
 def get_or_create_object_root(db: Session) -> models.Node:
     object_root = db.query(models.Node).filter(models.Node.title == "ObjectRoot").first()
     if not object_root:
         object_root = models.Node(title="ObjectRoot", content="The single root of the entire mind map graph.")
         db.add(object_root)
+        db.flush()
+        _record_change(db, NODE_CREATED, object_root.id)
         db.commit()
         db.refresh(object_root)
     return object_root
@@ -15,6 +48,8 @@ def create_node(db: Session, title: str, content: str = None, embedding: list[fl
     embedding_str = json.dumps(embedding) if embedding else None
     db_node = models.Node(title=title, content=content, embedding=embedding_str)
     db.add(db_node)
+    db.flush()
+    _record_change(db, NODE_CREATED, db_node.id)
     db.commit()
     db.refresh(db_node)
     return db_node
@@ -22,6 +57,7 @@ def create_node(db: Session, title: str, content: str = None, embedding: list[fl
 def create_edge(db: Session, source_id: int, target_id: int) -> models.Edge:
     db_edge = models.Edge(source_id=source_id, target_id=target_id)
     db.add(db_edge)
+    _record_change(db, EDGE_CREATED, target_id, source_id)
     db.commit()
     db.refresh(db_edge)
     return db_edge
@@ -31,11 +67,13 @@ def get_all_nodes_except(db: Session, node_ids_to_exclude: list[int]) -> list[mo
 
 def reparent_children(db: Session, old_parent_id: int, new_parent_id: int):
     db.query(models.Edge).filter(models.Edge.source_id == old_parent_id).update({"source_id": new_parent_id})
+    _record_change(db, EDGE_UPDATED, old_parent_id, new_parent_id)
     db.commit()
 
 def delete_node_and_parent_edge(db: Session, node_id: int):
     db.query(models.Edge).filter(models.Edge.target_id == node_id).delete()
     db.query(models.Node).filter(models.Node.id == node_id).delete()
+    _record_change(db, NODE_DELETED, node_id)
     db.commit()
 
 def delete_nodes_by_ids(db: Session, node_ids: list[int]):
@@ -51,6 +89,11 @@ def delete_nodes_by_ids(db: Session, node_ids: list[int]):
 
     # Delete the nodes
     db.query(models.Node).filter(models.Node.id.in_(node_ids)).delete(synchronize_session=False)
+    version = _bump_graph_version(db)
+    db.execute(
+        insert(models.GraphChange),
+        [{"version": version, "op": NODE_DELETED, "node_id": node_id} for node_id in node_ids],
+    )
     db.commit()
 
 def get_node_by_id(db: Session, node_id: int) -> models.Node:
@@ -77,4 +120,43 @@ def get_parent_for_node(db: Session, node_id: int) -> models.Node | None:
 
 def update_node_title(db: Session, node_id: int, new_title: str):
     db.query(models.Node).filter(models.Node.id == node_id).update({"title": new_title})
+    _record_change(db, NODE_UPDATED, node_id)
     db.commit()
+
+def get_node_embeddings(db: Session, node_ids: list[int] = None) -> list[tuple[int, str]]:
+    """
+    Returns (id, embedding JSON) pairs without loading full Node objects.
+    """
+    query = db.query(models.Node.id, models.Node.embedding).filter(models.Node.embedding.isnot(None))
+    if node_ids is not None:
+        query = query.filter(models.Node.id.in_(node_ids))
+    return query.order_by(models.Node.id).all()
+
+def get_graph_version(db: Session) -> int:
+    """
+    Returns the version of the latest committed change. Every change with a
+    lower or equal version is committed too, see models.GraphVersion.
+    """
+    return db.query(models.GraphVersion.version).filter(models.GraphVersion.id == 1).scalar() or 0
+
+def prune_changes(db: Session, keep_versions: int):
+    """
+    Deletes change log rows more than keep_versions versions old. Readers
+    further behind than that reload instead of replaying the log, so the
+    rows are no longer needed.
+    """
+    oldest_kept = get_graph_version(db) - keep_versions
+    if oldest_kept <= 0:
+        return
+    db.query(models.GraphChange).filter(models.GraphChange.version <= oldest_kept).delete(synchronize_session=False)
+    db.commit()
+
+def get_changes_since(db: Session, version: int, limit: int = None) -> list[models.GraphChange]:
+    query = (
+        db.query(models.GraphChange)
+        .filter(models.GraphChange.version > version)
+        .order_by(models.GraphChange.version, models.GraphChange.id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return query.all()
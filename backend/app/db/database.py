@@ -1,17 +1,108 @@
+import random
+import threading
+import time
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True
-)
+# Cookie that remembers when a client last used a write session.
+LAST_WRITE_COOKIE = "smm_last_write"
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _create_engine(database_url: str):
+    kwargs = {"pool_pre_ping": True}
+    url = make_url(database_url)
+    # In-memory SQLite uses a single-connection pool that takes no sizing options.
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return create_engine(database_url, **kwargs)
 
-def get_db():
+# Engines are built on first use rather than at import, so importing the app
+# needs neither a reachable database nor its driver.
+_engine = None
+_read_engines = None
+_read_session_locals = None
+_engine_lock = threading.Lock()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+def get_engine():
+    """
+    Returns the primary engine, creating it and binding SessionLocal on first call.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            if not settings.DATABASE_URL:
+                raise RuntimeError("DATABASE_URL is not configured.")
+            _engine = _create_engine(settings.DATABASE_URL)
+            SessionLocal.configure(bind=_engine)
+        return _engine
+
+def get_read_session_locals() -> list[sessionmaker]:
+    """
+    Returns one session factory per configured read replica.
+    """
+    global _read_engines, _read_session_locals
+    with _engine_lock:
+        if _read_session_locals is None:
+            _read_engines = [_create_engine(url) for url in settings.database_read_urls]
+            _read_session_locals = [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in _read_engines]
+        return _read_session_locals
+
+def dispose_engines():
+    """
+    Closes every pooled connection. The engines are rebuilt on next use.
+    """
+    global _engine, _read_engines, _read_session_locals
+    with _engine_lock:
+        for e in [_engine] + (_read_engines or []):
+            if e is not None:
+                e.dispose()
+        _engine = None
+        _read_engines = None
+        _read_session_locals = None
+
+def get_db(request: Request):
+    """
+    Write session on the primary. Marks the request so the client is routed
+    to the primary for its next reads (see READ_YOUR_WRITES_WINDOW).
+    """
+    request.state.db_write = True
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def _recently_wrote(request: Request) -> bool:
+    if settings.READ_YOUR_WRITES_WINDOW <= 0:
+        return False
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.READ_YOUR_WRITES_WINDOW
+
+def get_read_db(request: Request):
+    """
+    Read-only session for heavy reads. Uses a random replica when any are
+    configured, unless the client wrote recently.
+    """
+    read_session_locals = get_read_session_locals()
+    if read_session_locals and not _recently_wrote(request):
+        db = random.choice(read_session_locals)()
+    else:
+        get_engine()
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
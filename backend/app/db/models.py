@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, Text, DateTime, ForeignKey, event
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -28,3 +28,36 @@ class Edge(Base):
 
     source = relationship("Node", foreign_keys=[source_id], back_populates="children_edges")
     target = relationship("Node", foreign_keys=[target_id], back_populates="parent_edges")
+
+class GraphVersion(Base):
+    """
+    Single-row graph version counter. Every mutation bumps it with
+    UPDATE ... SET version = version + 1, whose row lock is held until commit,
+    so writers are serialized and versions are handed out in commit order.
+    Auto-increment ids are not: on InnoDB a later id can commit first.
+    """
+    __tablename__ = "graph_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+event.listen(
+    GraphVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO graph_version (id, version) VALUES (1, 0)"),
+)
+
+class GraphChange(Base):
+    """
+    Change log that per-process caches poll to catch up on other workers'
+    writes. version is the graph version of the transaction that made the
+    change; id only keeps rows of one transaction in order.
+    """
+    __tablename__ = "graph_changes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, index=True)
+    op = Column(String(32), nullable=False)
+    node_id = Column(Integer, nullable=True)
+    related_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
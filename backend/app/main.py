@@ -1,13 +1,51 @@
-from fastapi import FastAPI
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine, SessionLocal
+from app.core.config import settings
+from app.db.database import SessionLocal, LAST_WRITE_COOKIE, dispose_engines, get_engine
 from app.db import models, crud
 from app.api import endpoints
+from app.services.ai_service import ai_service
+from app.services.similarity_service import similarity_service
+from app.services.warmup import run_warmup_hooks
 
-# This will create the tables
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown.
+    - Creates database tables when CREATE_SCHEMA is set.
+    - Ensures the ObjectRoot node exists.
+    - Starts the warm-up hooks in the background.
+    - Closes the AI clients and database pools on shutdown.
+    """
+    engine = get_engine()
+    if settings.CREATE_SCHEMA:
+        models.Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        crud.get_or_create_object_root(db)
+    finally:
+        db.close()
+
+    warmup_stop = threading.Event()
+    warmup_task = asyncio.create_task(run_warmup_hooks(warmup_stop)) if settings.WARMUP_ON_STARTUP else None
 
-app = FastAPI(title="Super Mind Map System")
+    yield
+
+    if warmup_task:
+        # Let the hook already running in its thread finish before the
+        # engines it uses are disposed; later hooks are skipped.
+        warmup_stop.set()
+        await warmup_task
+    await similarity_service.aclose()
+    ai_service.close()
+    dispose_engines()
+
+app = FastAPI(title="Super Mind Map System", lifespan=lifespan)
 
 # Set up CORS
 origins = [
@@ -22,19 +60,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-def on_startup():
+@app.middleware("http")
+async def remember_writes(request: Request, call_next):
     """
-    Event handler for application startup.
-    - Creates database tables.
-    - Ensures the ObjectRoot node exists.
+    Sets the last-write cookie on responses to requests that used a write
+    session, so get_read_db can send the client's next reads to the primary.
     """
-    db = SessionLocal()
-    try:
-        crud.get_or_create_object_root(db)
-    finally:
-        db.close()
-
+    response = await call_next(request)
+    if getattr(request.state, "db_write", False) and settings.READ_YOUR_WRITES_WINDOW > 0:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            str(time.time()),
+            max_age=max(1, int(settings.READ_YOUR_WRITES_WINDOW)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
 
 @app.get("/")
 def read_root():
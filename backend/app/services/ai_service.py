@@ -1,13 +1,30 @@
-import openai
 import json
 from app.core.config import settings
 
 class AIService:
     def __init__(self):
-        self.client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            base_url=settings.OPENAI_BASE_URL,
-        )
+        self._client = None
+
+    @property
+    def client(self):
+        """
+        The OpenAI client, built on first use. Importing openai is slow and
+        the credentials may be missing, so neither is dealt with at import time.
+        """
+        if self._client is None:
+            if not settings.OPENAI_API_KEY or not settings.OPENAI_BASE_URL:
+                raise RuntimeError("OPENAI_API_KEY and OPENAI_BASE_URL must be configured.")
+            import openai
+            self._client = openai.OpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+            )
+        return self._client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
     def generate_mindmap(self, keyword: str) -> dict:
         """
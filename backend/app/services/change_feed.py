@@ -0,0 +1,59 @@
+import threading
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import crud
+
+class ChangeFeed:
+    """
+    Keeps per-process caches in step with the graph_changes log.
+
+    Each worker holds its own feed. sync() costs one single-row read when
+    nothing changed; otherwise subscribers receive only the new change rows.
+    A subscriber implements reload(db) for a full rebuild and
+    apply(db, changes) for deltas. Both must be idempotent, since a reload can
+    already include changes that are then replayed.
+    """
+
+    def __init__(self, max_delta: int = None):
+        self.max_delta = max_delta if max_delta is not None else settings.CHANGE_FEED_MAX_DELTA
+        self.version = None
+        self.subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber):
+        self.subscribers.append(subscriber)
+        # Let the new subscriber load on the next sync.
+        self.reset()
+
+    def reset(self):
+        """
+        Forces a full reload on the next sync.
+        """
+        self.version = None
+
+    def sync(self, db: Session) -> int:
+        """
+        Brings every subscriber up to the current graph version and returns it.
+        """
+        with self._lock:
+            latest = crud.get_graph_version(db)
+            # A version going backwards means the log was wiped or we are
+            # looking at another database, so the caches are meaningless.
+            if self.version is None or latest < self.version or latest - self.version > self.max_delta:
+                for subscriber in self.subscribers:
+                    subscriber.reload(db)
+            elif latest > self.version:
+                changes = crud.get_changes_since(db, self.version)
+                # Every version has at least one row, so a missing next
+                # version means another worker pruned rows we still needed.
+                if not changes or changes[0].version != self.version + 1:
+                    for subscriber in self.subscribers:
+                        subscriber.reload(db)
+                else:
+                    for subscriber in self.subscribers:
+                        subscriber.apply(db, changes)
+                    latest = max(latest, changes[-1].version)
+            self.version = latest
+            return latest
+
+change_feed = ChangeFeed()
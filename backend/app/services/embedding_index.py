@@ -0,0 +1,203 @@
+import json
+import struct
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db import crud
+from app.services.change_feed import change_feed
+
+# Shared-memory layout: header (ready, version, count, dim, created_at), then
+# count int64 node ids, then count * dim float64 values.
+_HEADER = struct.Struct("qqqqd")
+# A segment still not marked ready this many seconds after it was created
+# belongs to a publisher that died, and is replaced.
+_PUBLISH_TIMEOUT = 300
+
+class EmbeddingIndex:
+    """
+    In-process map of node id -> embedding vector, kept current through the
+    change feed so merges do not re-read and re-parse every embedding.
+
+    With shm_name set, the first worker to build the index publishes it as a
+    read-only matrix in shared memory. Workers on the same host then attach to
+    that matrix instead of loading their own copy, and keep only the changes
+    made after it was published in process memory. No worker owns the
+    segment: it stays in place when workers exit, so a restarted pool attaches
+    to it and replays the changes since. Once the matrix is more than
+    max_delta versions behind the change log (or ahead of it, i.e. from
+    another database), the next worker to reload unlinks it and publishes a
+    fresh one. Nothing else removes the segment; use unlink_shared_matrix to
+    free it.
+    """
+
+    def __init__(self, shm_name: str = None, max_delta: int = None):
+        self.shm_name = shm_name
+        self.max_delta = max_delta if max_delta is not None else settings.CHANGE_FEED_MAX_DELTA
+        self.vectors = {}
+        self._shm = None
+        self._shm_version = None
+
+    def reload(self, db: Session):
+        self._release_shm()
+        if self.shm_name and self._attach(db):
+            return
+
+        version = crud.get_graph_version(db)
+        for node_id, embedding in crud.get_node_embeddings(db):
+            self._set(node_id, embedding)
+        if self.shm_name:
+            self._publish(version)
+
+    def apply(self, db: Session, changes: list):
+        created = {}
+        for change in changes:
+            if change.op == crud.NODE_CREATED:
+                created[change.node_id] = True
+            elif change.op == crud.NODE_DELETED:
+                created.pop(change.node_id, None)
+                self.vectors.pop(change.node_id, None)
+        for node_id, embedding in crud.get_node_embeddings(db, list(created)):
+            self._set(node_id, embedding)
+
+        # Changes since the shared matrix live in this process only. Once
+        # there are too many, rebuild so every worker shares them again.
+        if self._shm_version is not None and changes and changes[-1].version - self._shm_version > self.max_delta:
+            self.reload(db)
+
+    def discard(self, node_id: int):
+        self.vectors.pop(node_id, None)
+
+    def get(self, node_id: int):
+        return self.vectors.get(node_id)
+
+    def items(self) -> list:
+        return list(self.vectors.items())
+
+    def _set(self, node_id: int, embedding: str):
+        vector = json.loads(embedding) if embedding else []
+        if vector:
+            self.vectors[node_id] = vector
+
+    def _attach(self, db: Session) -> bool:
+        try:
+            shm = shared_memory.SharedMemory(name=self.shm_name)
+        except (FileNotFoundError, ValueError):
+            # Missing, or created but not yet sized by its publisher.
+            return False
+        _untrack(shm)
+
+        header = _HEADER.unpack_from(shm.buf)
+        ready, version, count, dim, created_at = header
+        if not ready:
+            shm.close()
+            if time.time() - created_at > _PUBLISH_TIMEOUT:
+                print(f"Shared embedding matrix '{self.shm_name}' was never completed; replacing it.")
+                _unlink_segment(self.shm_name, header)
+            return False
+
+        # Replace a matrix that is too far behind to catch up on cheaply,
+        # whose changes have been pruned, or that is ahead of the change log
+        # because it was built from another database.
+        changes = None
+        graph_version = crud.get_graph_version(db)
+        if version <= graph_version and graph_version - version <= self.max_delta:
+            changes = crud.get_changes_since(db, version)
+            if graph_version > version and (not changes or changes[0].version != version + 1):
+                changes = None
+        if changes is None:
+            shm.close()
+            _unlink_segment(self.shm_name, header)
+            return False
+
+        ids_end = _HEADER.size + 8 * count
+        ids = shm.buf[_HEADER.size:ids_end].cast("q")
+        values = shm.buf[ids_end:ids_end + 8 * count * dim].toreadonly().cast("d")
+        self.vectors = {ids[i]: values[i * dim:(i + 1) * dim] for i in range(count)}
+        ids.release()
+        self._shm = shm
+        self._shm_version = version
+
+        # Catch up on everything written since the matrix was published.
+        self.apply(db, changes)
+        return True
+
+    def _publish(self, version: int):
+        if not self.vectors:
+            return
+        dim = len(next(iter(self.vectors.values())))
+        rows = [(node_id, vector) for node_id, vector in self.vectors.items() if len(vector) == dim]
+
+        ids_end = _HEADER.size + 8 * len(rows)
+        try:
+            shm = shared_memory.SharedMemory(name=self.shm_name, create=True, size=ids_end + 8 * len(rows) * dim)
+        except FileExistsError:
+            print(f"Shared embedding matrix '{self.shm_name}' is being published by another worker; "
+                  "keeping a private copy.")
+            return
+        _untrack(shm)
+        # Stamp the creation time first, so an abandoned segment can be detected.
+        _HEADER.pack_into(shm.buf, 0, 0, version, 0, 0, time.time())
+
+        shm.buf[_HEADER.size:ids_end] = array("q", (node_id for node_id, _ in rows)).tobytes()
+        values = array("d")
+        for _, vector in rows:
+            values.extend(vector)
+        shm.buf[ids_end:ids_end + len(values) * 8] = values.tobytes()
+        # Mark the segment ready last, so readers never see a partial matrix.
+        _HEADER.pack_into(shm.buf, 0, 1, version, len(rows), dim, time.time())
+        self._shm = shm
+        self._shm_version = version
+
+    def _release_shm(self):
+        self.vectors = {}
+        self._shm_version = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                # A merge still holds vectors from the old matrix; the mapping
+                # is freed together with them.
+                pass
+            self._shm = None
+
+def _untrack(shm: shared_memory.SharedMemory):
+    # Creating or attaching registers the segment with this process's resource
+    # tracker, which would unlink it for every worker when this one exits.
+    resource_tracker.unregister(shm._name, "shared_memory")
+
+def _unlink_segment(shm_name: str, expected_header: tuple = None) -> bool:
+    """
+    Unlinks the segment, but only if its header still equals expected_header,
+    so a worker never removes a fresh matrix that another worker has just
+    published under the same name. Returns False when there was nothing to do.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=shm_name)
+    except (FileNotFoundError, ValueError):
+        return False
+    try:
+        if expected_header is not None and _HEADER.unpack_from(shm.buf) != expected_header:
+            _untrack(shm)
+            return False
+        # unlink() unregisters the name, balancing the registration made by
+        # attaching above.
+        shm.unlink()
+        return True
+    except FileNotFoundError:
+        # Another worker unlinked it first.
+        _untrack(shm)
+        return False
+    finally:
+        shm.close()
+
+def unlink_shared_matrix(shm_name: str) -> bool:
+    """
+    Removes the shared embedding matrix, e.g. to free it on a host that no
+    longer runs the app.
+    """
+    return _unlink_segment(shm_name)
+
+embedding_index = EmbeddingIndex(settings.EMBEDDING_SHM_NAME)
+change_feed.subscribe(embedding_index)
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.services.ai_service import ai_service
 from app.services.similarity_service import similarity_service
+from app.services.change_feed import change_feed
+from app.services.embedding_index import embedding_index
 from app.db import crud
 from app.db.models import Node
 import json
@@ -18,6 +21,8 @@ class MindMapService:
         await self._add_node_recursively(db, mind_map_data, object_root.id, newly_created_nodes)
 
         await self._merge_similar_nodes(db, newly_created_nodes)
+        # Keep the change log bounded; anything older would trigger a reload anyway.
+        crud.prune_changes(db, settings.CHANGE_FEED_MAX_DELTA)
 
         return mind_map_data
 
@@ -44,22 +49,29 @@ class MindMapService:
 
         new_node_ids = [node.id for node in new_nodes]
         object_root = crud.get_or_create_object_root(db)
-        ids_to_exclude = new_node_ids + [object_root.id]
-        existing_nodes = crud.get_all_nodes_except(db, ids_to_exclude)
+        ids_to_exclude = set(new_node_ids + [object_root.id])
+
+        # Catch up with writes from this and other workers, then compare
+        # against the cached embeddings instead of re-reading every node.
+        change_feed.sync(db)
+        existing_embeddings = [
+            (node_id, embedding) for node_id, embedding in embedding_index.items() if node_id not in ids_to_exclude
+        ]
 
         for new_node in new_nodes:
             new_node_embedding = json.loads(new_node.embedding) if new_node.embedding else []
             if not new_node_embedding:
                 continue
 
-            for existing_node in existing_nodes:
-                existing_node_embedding = json.loads(existing_node.embedding) if existing_node.embedding else []
-                if not existing_node_embedding:
-                    continue
-
+            for existing_node_id, existing_node_embedding in existing_embeddings:
                 similarity = similarity_service.cosine_similarity(new_node_embedding, existing_node_embedding)
 
                 if similarity > 0.95:
+                    existing_node = crud.get_node_by_id(db, existing_node_id)
+                    if existing_node is None:
+                        # Deleted since the index was synced; not a conflict.
+                        embedding_index.discard(existing_node_id)
+                        continue
                     # --- Start of new renaming logic ---
                     # A similarity conflict is found. We rename both nodes to make them distinct.
 
@@ -110,6 +122,7 @@ class MindMapService:
         all_ids_to_delete = self._get_all_descendant_ids(db, node_id)
         all_ids_to_delete.add(node_id)
         crud.delete_nodes_by_ids(db, list(all_ids_to_delete))
+        crud.prune_changes(db, settings.CHANGE_FEED_MAX_DELTA)
 
     def _get_all_descendant_ids(self, db: Session, node_id: int) -> set[int]:
         """
@@ -4,13 +4,29 @@ import math
 
 class SimilarityService:
     def __init__(self):
-        self.base_url = settings.API_BASE or settings.OPENAI_BASE_URL
-        self.api_key = settings.EMBEDDING_API_KEY or settings.OPENAI_API_KEY
         self.embedding_model = settings.EMBEDDING_MODEL_NAME
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={"Authorization": f"Bearer {self.api_key}"}
-        )
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        The embeddings HTTP client, built on first use.
+        """
+        if self._client is None:
+            base_url = settings.API_BASE or settings.OPENAI_BASE_URL
+            api_key = settings.EMBEDDING_API_KEY or settings.OPENAI_API_KEY
+            if not base_url or not api_key:
+                raise RuntimeError("No embeddings endpoint configured: set API_BASE/EMBEDDING_API_KEY or OPENAI_BASE_URL/OPENAI_API_KEY.")
+            self._client = httpx.AsyncClient(
+                base_url=base_url,
+                headers={"Authorization": f"Bearer {api_key}"}
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def get_embedding(self, text: str) -> list[float]:
         """
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+from app.db.database import SessionLocal, get_engine
+from app.services.change_feed import change_feed
+
+_warmup_hooks = []
+
+def warmup_hook(func):
+    """
+    Registers func(db) to run in the background once the app has started.
+    """
+    _warmup_hooks.append(func)
+    return func
+
+@warmup_hook
+def preload_caches(db):
+    # Loads the embedding index and any other change feed subscriber, so the
+    # first add does not pay for it.
+    change_feed.sync(db)
+
+def _run_hook(hook):
+    get_engine()
+    db = SessionLocal()
+    try:
+        hook(db)
+    finally:
+        db.close()
+
+async def run_warmup_hooks(stop: threading.Event = None):
+    """
+    Runs every registered hook in a worker thread, one after another. A
+    failing hook is logged and skipped; the caches it meant to fill are then
+    loaded on first use instead. Once stop is set no further hook starts.
+    A running hook cannot be interrupted, so set stop and await this
+    coroutine rather than cancelling it.
+    """
+    for hook in _warmup_hooks:
+        if stop is not None and stop.is_set():
+            return
+        try:
+            await asyncio.to_thread(_run_hook, hook)
+        except Exception as e:
+            print(f"Warm-up hook '{hook.__name__}' failed: {e}")
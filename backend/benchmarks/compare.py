@@ -0,0 +1,58 @@
+"""
+Compares two benchmark result files written by benchmarks.run.
+
+Usage (from the backend directory):
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+METRICS = ["p50_ms", "p99_ms", "throughput_rps"]
+
+
+def _index(report: dict) -> dict:
+    return {
+        (run["nodes"], operation): stats
+        for run in report["runs"]
+        for operation, stats in run["operations"].items()
+    }
+
+
+def compare(baseline: dict, candidate: dict) -> list[dict]:
+    """
+    Returns one row per (nodes, operation) present in both reports, with the
+    relative change of every metric (positive means the number went up).
+    """
+    base_index = _index(baseline)
+    rows = []
+    for key, stats in _index(candidate).items():
+        if key not in base_index:
+            continue
+        row = {"nodes": key[0], "operation": key[1]}
+        for metric in METRICS:
+            old, new = base_index[key][metric], stats[metric]
+            row[metric] = {"baseline": old, "candidate": new, "change": (new - old) / old if old else None}
+        rows.append(row)
+    return rows
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args(argv)
+
+    rows = compare(json.loads(args.baseline.read_text()), json.loads(args.candidate.read_text()))
+    print(f"{'nodes':>9} {'operation':<9} " + " ".join(f"{m:>24}" for m in METRICS))
+    for row in rows:
+        cells = []
+        for metric in METRICS:
+            change = row[metric]["change"]
+            change_str = f"{change:+.1%}" if change is not None else "n/a"
+            cells.append(f"{row[metric]['candidate']:>14} ({change_str:>7})")
+        print(f"{row['nodes']:>9} {row['operation']:<9} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def deterministic_embedding(text: str, dim: int) -> list[float]:
+    """
+    Returns a unit-length vector derived only from the text, so every run
+    sees exactly the same embeddings.
+    """
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    magnitude = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / magnitude for v in vector]
+
+
+def synthetic_mindmap(keyword: str, breadth: int, depth: int) -> dict:
+    """
+    Builds a mind map tree with the given branching factor and depth.
+    """
+    def build(title: str, level: int) -> dict:
+        children = []
+        if level < depth:
+            children = [build(f"{title}.{i + 1}", level + 1) for i in range(breadth)]
+        return {"title": title, "children": children}
+
+    return build(keyword, 0)
+
+
+class FakeAIServer:
+    """
+    A local stand-in for the OpenAI-compatible chat completion and
+    embeddings endpoints.
+
+    Both endpoints answer after a configurable latency. Chat completions
+    return a synthetic mind map for the keyword found in the prompt, and
+    embeddings are deterministic per input text.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chat_latency: float = 0.0,
+        embedding_latency: float = 0.0,
+        embedding_dim: int = 64,
+        breadth: int = 3,
+        depth: int = 2,
+    ):
+        self.chat_latency = chat_latency
+        self.embedding_latency = embedding_latency
+        self.embedding_dim = embedding_dim
+        self.breadth = breadth
+        self.depth = depth
+        self.request_counts = {"chat": 0, "embeddings": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.request_counts[kind] += 1
+
+    def chat_completion(self, payload: dict) -> dict:
+        prompt = payload["messages"][-1]["content"]
+        # The prompt embeds the keyword as: based on the keyword '<keyword>'.
+        marker = "keyword '"
+        start = prompt.find(marker)
+        keyword = "benchmark"
+        if start != -1:
+            start += len(marker)
+            keyword = prompt[start:prompt.find("'", start)]
+
+        mind_map = synthetic_mindmap(keyword, self.breadth, self.depth)
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(mind_map)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def embeddings(self, payload: dict) -> dict:
+        inputs = payload["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return {
+            "object": "list",
+            "model": payload.get("model", "fake"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": deterministic_embedding(text, self.embedding_dim)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path.endswith("/chat/completions"):
+                    fake._count("chat")
+                    time.sleep(fake.chat_latency)
+                    body = fake.chat_completion(payload)
+                elif self.path.endswith("/embeddings"):
+                    fake._count("embeddings")
+                    time.sleep(fake.embedding_latency)
+                    body = fake.embeddings(payload)
+                else:
+                    self.send_error(404)
+                    return
+
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                # Keep benchmark output clean.
+                pass
+
+        return Handler
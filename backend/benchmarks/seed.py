@@ -0,0 +1,94 @@
+import datetime
+import json
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.db import models
+from benchmarks.fake_servers import deterministic_embedding
+
+
+@dataclass
+class SeededGraph:
+    object_root_id: int
+    node_count: int
+    edge_count: int
+    map_root_ids: list[int] = field(default_factory=list)
+
+
+def seed_graph(
+    engine: Engine,
+    node_count: int,
+    breadth: int = 3,
+    depth: int = 2,
+    embedding_dim: int = 0,
+    chunk_size: int = 10_000,
+) -> SeededGraph:
+    """
+    Fills an empty database with a synthetic graph of roughly node_count
+    nodes (ObjectRoot included).
+
+    The graph is a forest of mind maps hanging off ObjectRoot, each a full
+    tree of the given breadth and depth, which is the shape /api/add
+    produces. Rows are written with bulk inserts in chunks so that 1M nodes
+    seed in reasonable time on both SQLite and MySQL.
+    """
+    models.Base.metadata.create_all(bind=engine)
+    now = datetime.datetime.utcnow()
+
+    # Nodes per map: 1 + breadth + breadth^2 + ... + breadth^depth
+    map_size = sum(breadth ** level for level in range(depth + 1))
+
+    object_root_id = 1
+    seeded = SeededGraph(object_root_id=object_root_id, node_count=1, edge_count=0)
+    node_rows = [{
+        "id": object_root_id,
+        "title": "ObjectRoot",
+        "content": "The single root of the entire mind map graph.",
+        "created_at": now,
+        "embedding": None,
+    }]
+    edge_rows = []
+
+    def node_row(node_id: int, title: str) -> dict:
+        embedding = None
+        if embedding_dim:
+            embedding = json.dumps(deterministic_embedding(title, embedding_dim))
+        return {"id": node_id, "title": title, "content": title, "created_at": now, "embedding": embedding}
+
+    with engine.begin() as conn:
+        def flush(force: bool = False):
+            if not force and len(node_rows) < chunk_size:
+                return
+            # Edges reference nodes, so nodes are always written first.
+            if node_rows:
+                conn.execute(insert(models.Node), node_rows)
+                node_rows.clear()
+            if edge_rows:
+                conn.execute(insert(models.Edge), edge_rows)
+                edge_rows.clear()
+
+        next_id = object_root_id + 1
+        map_index = 0
+        # Always seed at least one map so export and delete have a target.
+        while seeded.node_count + map_size <= max(node_count, 1 + map_size):
+            map_index += 1
+            map_root_id = next_id
+            seeded.map_root_ids.append(map_root_id)
+
+            # Breadth-first layout: parent of the k-th node in the map is (k - 1) // breadth.
+            for k in range(map_size):
+                node_id = map_root_id + k
+                node_rows.append(node_row(node_id, f"Map {map_index} node {k}"))
+                parent_id = object_root_id if k == 0 else map_root_id + (k - 1) // breadth
+                edge_rows.append({"source_id": parent_id, "target_id": node_id})
+                flush()
+
+            next_id += map_size
+            seeded.node_count += map_size
+            seeded.edge_count += map_size
+
+        flush(force=True)
+
+    return seeded
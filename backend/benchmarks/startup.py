@@ -0,0 +1,116 @@
+"""
+Startup-time benchmark for the Super Mind Map API.
+
+Every sample is a fresh interpreter, so module import costs are measured cold.
+Reports the time to import app.main, to finish the lifespan startup, to serve
+the first request, and to run the warm-up hooks against a seeded database.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup --samples 10 --nodes 10000
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from benchmarks.run import RESULTS_DIR, _git_commit, summarize
+from benchmarks.seed import seed_graph
+
+PHASES = ["import", "startup", "first_request", "warmup"]
+
+# Runs in the child interpreter and prints one JSON line of phase durations.
+_CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    started = time.perf_counter()
+    client.get("/")
+    served = time.perf_counter()
+    from app.services.warmup import run_warmup_hooks
+    asyncio.run(run_warmup_hooks())
+    warmed = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "startup": started - imported,
+    "first_request": served - started,
+    "warmup": warmed - served,
+}))
+"""
+
+
+def measure_once(database_url: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        # No credentials: startup must not need them.
+        "OPENAI_API_KEY": "",
+        "OPENAI_BASE_URL": "",
+        # Hooks are timed explicitly rather than racing in the background.
+        "WARMUP_ON_STARTUP": "false",
+    })
+    output = subprocess.check_output(
+        [sys.executable, "-c", _CHILD], cwd=Path(__file__).parent.parent, env=env, text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Benchmark Super Mind Map API startup.")
+    parser.add_argument("--samples", type=int, default=10, help="Fresh interpreters to start.")
+    parser.add_argument("--nodes", type=int, default=1_000, help="Size of the seeded graph the warm-up loads.")
+    parser.add_argument("--embedding-dim", type=int, default=64)
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Where to write the JSON results. Defaults to benchmarks/results/startup-<timestamp>.json.")
+    parser.add_argument("--keep-workdir", action="store_true",
+                        help="Keep the temporary directory holding the seeded SQLite database instead of deleting it.")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="supermindmap-startup-")
+    samples = {phase: [] for phase in PHASES}
+    try:
+        database_url = f"sqlite:///{workdir}/startup.db"
+        engine = create_engine(database_url)
+        seed_graph(engine, args.nodes, embedding_dim=args.embedding_dim)
+        engine.dispose()
+
+        for _ in range(args.samples):
+            for phase, seconds in measure_once(database_url).items():
+                samples[phase].append(seconds)
+    finally:
+        if args.keep_workdir:
+            print(f"Database kept in {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "config": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        },
+        "phases": {phase: summarize(values) for phase, values in samples.items()},
+    }
+    for phase, stats in report["phases"].items():
+        print(f"{phase:<14} p50={stats['p50_ms']}ms p99={stats['p99_ms']}ms", file=sys.stderr)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"startup-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.db.models import Base  # Correct import for Base
+from app.services.change_feed import change_feed
 import os
 import pytest_asyncio
 
@@ -58,5 +59,9 @@ async def client(db_session):
             db_session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Every test rolls its data back, so per-process caches must start over.
+    change_feed.reset()
     yield TestClient(app)
     del app.dependency_overrides[get_db]
+    del app.dependency_overrides[get_read_db]
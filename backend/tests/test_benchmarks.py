@@ -0,0 +1,54 @@
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db import crud
+from benchmarks.fake_servers import FakeAIServer, deterministic_embedding
+from benchmarks.run import percentile, summarize
+from benchmarks.seed import seed_graph
+
+
+def test_fake_server_is_deterministic():
+    with FakeAIServer(embedding_dim=8, breadth=2, depth=1) as fake:
+        response = httpx.post(f"{fake.base_url}/embeddings", json={"input": "Python", "model": "fake"})
+        assert response.status_code == 200
+        assert response.json()["data"][0]["embedding"] == deterministic_embedding("Python", 8)
+
+        response = httpx.post(
+            f"{fake.base_url}/chat/completions",
+            json={"model": "fake", "messages": [{"role": "user", "content": "based on the keyword 'Python'."}]},
+        )
+        assert response.status_code == 200
+        assert '"title": "Python"' in response.json()["choices"][0]["message"]["content"]
+        assert fake.request_counts == {"chat": 1, "embeddings": 1}
+
+
+def test_seed_graph_builds_forest_under_object_root(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/seed.db")
+    seeded = seed_graph(engine, 100, breadth=3, depth=2, embedding_dim=4)
+
+    # 1 ObjectRoot + 7 maps of 13 nodes each
+    assert seeded.node_count == 92
+    assert len(seeded.map_root_ids) == 7
+
+    db = sessionmaker(bind=engine)()
+    try:
+        assert crud.get_or_create_object_root(db).id == seeded.object_root_id
+        assert len(crud.get_children_for_node(db, seeded.object_root_id)) == 7
+        assert len(crud.get_children_for_node(db, seeded.map_root_ids[0])) == 3
+        assert db.query(crud.models.Edge).count() == seeded.edge_count
+    finally:
+        db.close()
+    engine.dispose()
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+    assert percentile([], 50) == 0.0
+
+
+def test_throughput_uses_wall_clock_time():
+    # Four overlapping 100 ms requests that finished within 100 ms of wall time.
+    stats = summarize([0.1, 0.1, 0.1, 0.1], wall_seconds=0.1)
+    assert stats["throughput_rps"] == 40.0
+    assert stats["p50_ms"] == 100.0
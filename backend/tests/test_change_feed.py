@@ -0,0 +1,290 @@
+import subprocess
+import sys
+import time
+import uuid
+from multiprocessing import shared_memory
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.db import crud, models
+from app.services.change_feed import ChangeFeed
+from app.services.embedding_index import _HEADER, EmbeddingIndex, _unlink_segment, unlink_shared_matrix
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+class RecordingSubscriber:
+    def __init__(self):
+        self.reloads = 0
+        self.applied = []
+
+    def reload(self, db):
+        self.reloads += 1
+
+    def apply(self, db, changes):
+        self.applied.extend(change.op for change in changes)
+
+
+def test_mutations_are_logged_with_increasing_versions(db_session: Session):
+    start = crud.get_graph_version(db_session)
+
+    node_id = crud.create_node(db_session, title="A").id
+    crud.create_edge(db_session, source_id=node_id, target_id=node_id)
+    crud.update_node_title(db_session, node_id, "B")
+    crud.delete_nodes_by_ids(db_session, [node_id])
+
+    changes = crud.get_changes_since(db_session, start)
+    assert [change.op for change in changes] == [
+        crud.NODE_CREATED, crud.EDGE_CREATED, crud.NODE_UPDATED, crud.NODE_DELETED,
+    ]
+    assert all(change.node_id == node_id for change in changes)
+    assert [change.version for change in changes] == list(range(start + 1, start + 5))
+    assert crud.get_graph_version(db_session) == changes[-1].version
+
+
+def test_prune_keeps_only_recent_versions(db_session: Session):
+    for i in range(5):
+        crud.create_node(db_session, title=f"Node {i}")
+    latest = crud.get_graph_version(db_session)
+
+    crud.prune_changes(db_session, keep_versions=2)
+
+    remaining = crud.get_changes_since(db_session, 0)
+    assert [change.version for change in remaining] == [latest - 1, latest]
+
+
+def test_feed_applies_deltas_and_reloads_when_version_goes_back(db_session: Session):
+    feed = ChangeFeed()
+    subscriber = RecordingSubscriber()
+    feed.subscribe(subscriber)
+
+    feed.sync(db_session)
+    assert subscriber.reloads == 1
+
+    crud.create_node(db_session, title="A")
+    feed.sync(db_session)
+    feed.sync(db_session)
+    assert subscriber.reloads == 1
+    assert subscriber.applied == [crud.NODE_CREATED]
+
+    feed.version += 100
+    feed.sync(db_session)
+    assert subscriber.reloads == 2
+
+
+def test_feed_follows_commit_order_not_row_ids(db_session: Session):
+    feed = ChangeFeed()
+    subscriber = RecordingSubscriber()
+    feed.subscribe(subscriber)
+    feed.sync(db_session)
+
+    # Two workers insert change rows; the one holding the higher id commits first.
+    version = crud._bump_graph_version(db_session)
+    db_session.add(models.GraphChange(id=1000, version=version, op=crud.NODE_DELETED, node_id=1))
+    db_session.commit()
+    feed.sync(db_session)
+    assert subscriber.applied == [crud.NODE_DELETED]
+
+    version = crud._bump_graph_version(db_session)
+    db_session.add(models.GraphChange(id=900, version=version, op=crud.NODE_CREATED, node_id=2))
+    db_session.commit()
+    feed.sync(db_session)
+    assert subscriber.applied == [crud.NODE_DELETED, crud.NODE_CREATED]
+
+
+def test_feed_reloads_when_needed_changes_were_pruned(db_session: Session):
+    feed = ChangeFeed()
+    subscriber = RecordingSubscriber()
+    feed.subscribe(subscriber)
+    feed.sync(db_session)
+
+    for i in range(3):
+        crud.create_node(db_session, title=f"Node {i}")
+    # Another worker prunes between our version read and change read.
+    crud.prune_changes(db_session, keep_versions=1)
+
+    feed.sync(db_session)
+    assert subscriber.reloads == 2
+    assert subscriber.applied == []
+    assert feed.version == crud.get_graph_version(db_session)
+
+
+def test_embedding_index_follows_changes(db_session: Session):
+    feed = ChangeFeed()
+    index = EmbeddingIndex()
+    feed.subscribe(index)
+
+    removed_id = crud.create_node(db_session, title="Removed", embedding=[1.0, 0.0]).id
+    feed.sync(db_session)
+    assert index.get(removed_id) == [1.0, 0.0]
+
+    added_id = crud.create_node(db_session, title="Added", embedding=[0.0, 1.0]).id
+    crud.delete_nodes_by_ids(db_session, [removed_id])
+    feed.sync(db_session)
+    assert index.get(removed_id) is None
+    assert index.get(added_id) == [0.0, 1.0]
+
+
+def test_workers_share_published_embedding_matrix(db_session: Session):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    first = crud.create_node(db_session, title="First", embedding=[1.0, 2.0, 3.0])
+
+    publisher = EmbeddingIndex(shm_name)
+    publisher.reload(db_session)
+    try:
+        later = crud.create_node(db_session, title="Later", embedding=[4.0, 5.0, 6.0])
+
+        reader = EmbeddingIndex(shm_name)
+        reader.reload(db_session)
+        # Published vectors are read-only views into shared memory.
+        assert isinstance(reader.get(first.id), memoryview)
+        assert reader.get(first.id).readonly
+        assert list(reader.get(first.id)) == [1.0, 2.0, 3.0]
+        # Writes after publishing are replayed from the change log.
+        assert reader.get(later.id) == [4.0, 5.0, 6.0]
+    finally:
+        unlink_shared_matrix(shm_name)
+
+
+def test_stale_embedding_matrix_is_replaced(db_session: Session):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    crud.create_node(db_session, title="First", embedding=[1.0, 2.0])
+
+    publisher = EmbeddingIndex(shm_name)
+    publisher.reload(db_session)
+    try:
+        # Pretend the matrix came from a database further ahead than this one.
+        _HEADER.pack_into(publisher._shm.buf, 0, 1, crud.get_graph_version(db_session) + 100, 0, 2, time.time())
+
+        reader = EmbeddingIndex(shm_name)
+        reader.reload(db_session)
+        assert all(isinstance(vector, list) for _, vector in reader.items())
+        assert len(reader.items()) == len(publisher.items())
+    finally:
+        unlink_shared_matrix(shm_name)
+
+
+def test_published_matrix_survives_publisher_exit(tmp_path):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    engine = create_engine(f"sqlite:///{tmp_path}/shared.db")
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        node_id = crud.create_node(db, title="First", embedding=[1.0, 2.0]).id
+
+        publisher = (
+            "from sqlalchemy import create_engine\n"
+            "from sqlalchemy.orm import sessionmaker\n"
+            "from app.services.embedding_index import EmbeddingIndex\n"
+            f"db = sessionmaker(bind=create_engine('sqlite:///{tmp_path}/shared.db'))()\n"
+            f"EmbeddingIndex('{shm_name}').reload(db)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", publisher], cwd=BACKEND_DIR, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert "leaked" not in result.stderr
+
+        reader = EmbeddingIndex(shm_name)
+        reader.reload(db)
+        assert isinstance(reader.get(node_id), memoryview)
+        reader._release_shm()
+    finally:
+        db.close()
+        engine.dispose()
+        unlink_shared_matrix(shm_name)
+
+
+def test_matrix_too_far_behind_is_republished(db_session: Session):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    crud.create_node(db_session, title="First", embedding=[1.0, 2.0])
+
+    publisher = EmbeddingIndex(shm_name, max_delta=2)
+    publisher.reload(db_session)
+    try:
+        for i in range(3):
+            crud.create_node(db_session, title=f"Later {i}", embedding=[3.0, 4.0])
+
+        # A fresh worker finds the matrix 3 versions behind and replaces it.
+        reader = EmbeddingIndex(shm_name, max_delta=2)
+        reader.reload(db_session)
+        assert reader._shm_version == crud.get_graph_version(db_session)
+        assert len(reader.items()) == len(publisher.items()) + 3
+
+        # A worker that is attached republishes once its own delta grows too large.
+        feed = ChangeFeed()
+        attached = EmbeddingIndex(shm_name, max_delta=2)
+        feed.subscribe(attached)
+        feed.sync(db_session)
+        assert isinstance(attached.items()[0][1], memoryview)
+        for i in range(3):
+            crud.create_node(db_session, title=f"Newer {i}", embedding=[5.0, 6.0])
+        feed.sync(db_session)
+        assert attached._shm_version == crud.get_graph_version(db_session)
+        assert len(attached.items()) == len(reader.items()) + 3
+    finally:
+        unlink_shared_matrix(shm_name)
+
+
+def test_replacing_a_stale_matrix_never_removes_a_fresh_one(db_session: Session):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    crud.create_node(db_session, title="First", embedding=[1.0, 2.0])
+
+    publisher = EmbeddingIndex(shm_name)
+    publisher.reload(db_session)
+    try:
+        fresh_header = _HEADER.unpack_from(publisher._shm.buf)
+        # A worker that judged an older matrix stale must leave this one alone.
+        stale_header = (1, fresh_header[1] - 1) + fresh_header[2:]
+        assert _unlink_segment(shm_name, stale_header) is False
+        assert EmbeddingIndex(shm_name)._attach(db_session) is True
+
+        # Several workers replacing the same matrix: only the first unlinks it.
+        assert _unlink_segment(shm_name, fresh_header) is True
+        assert _unlink_segment(shm_name, fresh_header) is False
+    finally:
+        unlink_shared_matrix(shm_name)
+
+
+def test_abandoned_unfinished_matrix_is_replaced(db_session: Session):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    crud.create_node(db_session, title="First", embedding=[1.0, 2.0])
+
+    # A publisher died before marking its segment ready.
+    abandoned = shared_memory.SharedMemory(name=shm_name, create=True, size=_HEADER.size)
+    _HEADER.pack_into(abandoned.buf, 0, 0, 0, 0, 0, time.time())
+    abandoned.close()
+    try:
+        # Still within the timeout, the publisher may just be slow.
+        reader = EmbeddingIndex(shm_name)
+        reader.reload(db_session)
+        assert reader._shm is None
+
+        abandoned = shared_memory.SharedMemory(name=shm_name)
+        _HEADER.pack_into(abandoned.buf, 0, 0, 0, 0, 0, time.time() - 3600)
+        abandoned.close()
+
+        reader.reload(db_session)
+        assert reader._shm is not None
+        assert _HEADER.unpack_from(reader._shm.buf)[0] == 1
+    finally:
+        unlink_shared_matrix(shm_name)
+
+
+def test_matrix_whose_changes_were_pruned_is_republished(db_session: Session):
+    shm_name = f"smm-test-{uuid.uuid4().hex[:8]}"
+    crud.create_node(db_session, title="First", embedding=[1.0, 2.0])
+
+    publisher = EmbeddingIndex(shm_name)
+    publisher.reload(db_session)
+    try:
+        for i in range(3):
+            crud.create_node(db_session, title=f"Later {i}", embedding=[3.0, 4.0])
+        crud.prune_changes(db_session, keep_versions=1)
+
+        reader = EmbeddingIndex(shm_name)
+        reader.reload(db_session)
+        assert reader._shm_version == crud.get_graph_version(db_session)
+        assert len(reader.items()) == len(publisher.items()) + 3
+    finally:
+        unlink_shared_matrix(shm_name)
@@ -90,3 +90,26 @@ async def test_combine_on_add(client: TestClient, db_session: Session, monkeypat
     parent_b_edge = db_session.query(crud.models.Edge).filter_by(target_id=renamed_b_node.id).one()
     parent_b_node = crud.get_node_by_id(db_session, parent_b_edge.source_id)
     assert parent_b_node.title == "Fundamentals"
+
+
+@pytest.mark.asyncio
+async def test_add_skips_nodes_deleted_since_index_sync(client: TestClient, db_session: Session, monkeypatch):
+    from app.services.ai_service import ai_service
+    from app.services.similarity_service import similarity_service
+    from app.services.change_feed import change_feed
+    from app.services.embedding_index import embedding_index
+
+    async def mock_get_embedding(text: str):
+        return [1.0, 0.0, 0.0, 0.0]
+
+    monkeypatch.setattr(ai_service, "generate_mindmap", lambda keyword: {"title": keyword, "children": []})
+    monkeypatch.setattr(similarity_service, "get_embedding", mock_get_embedding)
+
+    # The index still holds a node that another worker has already deleted.
+    change_feed.sync(db_session)
+    monkeypatch.setattr(change_feed, "sync", lambda db: change_feed.version)
+    monkeypatch.setitem(embedding_index.vectors, 9999, [1.0, 0.0, 0.0, 0.0])
+
+    response = client.post("/api/add", json={"keyword": "Ghost"})
+    assert response.status_code == 200
+    assert embedding_index.get(9999) is None
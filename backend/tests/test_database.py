@@ -0,0 +1,91 @@
+import time
+from types import SimpleNamespace
+from app.core.config import settings
+from app.db import database
+
+
+class FakeSession:
+    def __init__(self, name):
+        self.name = name
+
+    def close(self):
+        pass
+
+
+def _request(cookies=None):
+    return SimpleNamespace(cookies=cookies or {}, state=SimpleNamespace())
+
+
+def _read_session(request):
+    dependency = database.get_read_db(request)
+    db = next(dependency)
+    dependency.close()
+    return db.name
+
+
+def test_reads_use_replica_unless_client_wrote_recently(monkeypatch):
+    monkeypatch.setattr(database, "get_engine", lambda: None)
+    monkeypatch.setattr(database, "SessionLocal", lambda: FakeSession("primary"))
+    monkeypatch.setattr(database, "get_read_session_locals", lambda: [lambda: FakeSession("replica")])
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_WINDOW", 5.0)
+
+    assert _read_session(_request()) == "replica"
+
+    recent = {database.LAST_WRITE_COOKIE: str(time.time())}
+    assert _read_session(_request(recent)) == "primary"
+
+    stale = {database.LAST_WRITE_COOKIE: str(time.time() - 60)}
+    assert _read_session(_request(stale)) == "replica"
+
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_WINDOW", 0)
+    assert _read_session(_request(recent)) == "replica"
+
+
+def test_reads_use_primary_without_replicas(monkeypatch):
+    monkeypatch.setattr(database, "get_engine", lambda: None)
+    monkeypatch.setattr(database, "SessionLocal", lambda: FakeSession("primary"))
+    monkeypatch.setattr(database, "get_read_session_locals", lambda: [])
+    assert _read_session(_request()) == "primary"
+
+
+def test_write_session_marks_request(monkeypatch):
+    monkeypatch.setattr(database, "get_engine", lambda: None)
+    monkeypatch.setattr(database, "SessionLocal", lambda: FakeSession("primary"))
+    request = _request()
+    dependency = database.get_db(request)
+    assert next(dependency).name == "primary"
+    dependency.close()
+    assert request.state.db_write is True
+
+
+def test_client_reads_its_own_writes_end_to_end(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.db.models import Base
+    from app.main import app
+
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path}/primary.db")
+    monkeypatch.setattr(settings, "DATABASE_READ_URLS", f"sqlite:///{tmp_path}/replica.db")
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_WINDOW", 5.0)
+    database.dispose_engines()
+    try:
+        # The replica lags: it has the schema but none of the primary's rows.
+        Base.metadata.create_all(bind=database.get_engine())
+        database.get_read_session_locals()
+        for read_engine in database._read_engines:
+            Base.metadata.create_all(bind=read_engine)
+
+        client = TestClient(app)
+        assert client.get("/api/graph").json()["nodes"] == []
+
+        # Deleting a missing node is a harmless write that still creates ObjectRoot.
+        response = client.delete("/api/nodes/999")
+        assert response.status_code == 204
+        assert database.LAST_WRITE_COOKIE in response.cookies
+
+        nodes = client.get("/api/graph").json()["nodes"]
+        assert [node["name"] for node in nodes] == ["ObjectRoot"]
+
+        # A client without the cookie still reads from the replica.
+        assert TestClient(app).get("/api/graph").json()["nodes"] == []
+    finally:
+        database.dispose_engines()
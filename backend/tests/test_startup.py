@@ -0,0 +1,93 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db import crud, database
+from app.main import app
+from app.services.ai_service import ai_service
+from app.services.change_feed import change_feed
+from app.services.similarity_service import similarity_service
+
+
+def test_import_builds_no_clients():
+    assert ai_service._client is None
+    assert similarity_service._client is None
+
+
+def test_lifespan_creates_schema_and_warms_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path}/startup.db")
+    database.dispose_engines()
+    change_feed.reset()
+    try:
+        with TestClient(app) as client:
+            assert client.get("/").status_code == 200
+            engine = database.get_engine()
+            # Warm-up runs in the background; give it a moment before shutdown.
+            deadline = time.monotonic() + 5
+            while change_feed.version is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            assert crud.get_or_create_object_root(db).id == 1
+        finally:
+            db.close()
+        # The background warm-up synced the change feed with the new database.
+        assert change_feed.version == 1
+        # Shutdown released the pooled engine.
+        assert database._engine is None
+    finally:
+        database.dispose_engines()
+        change_feed.reset()
+
+
+def test_app_imports_with_empty_environment(tmp_path):
+    # No .env in the working directory and nothing in the environment.
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(Path(__file__).parent.parent)},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_missing_credentials_fail_on_first_use(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", None)
+    monkeypatch.setattr(ai_service, "_client", None)
+    assert ai_service.generate_mindmap("Anything") is None
+    assert ai_service._client is None
+
+
+def test_shutdown_waits_for_running_warmup_hook(tmp_path, monkeypatch):
+    import app.main as main
+    from app.services import warmup
+
+    events = []
+    started = threading.Event()
+
+    def slow_hook(db):
+        started.set()
+        time.sleep(0.2)
+        events.append("slow hook finished")
+
+    def later_hook(db):
+        events.append("later hook ran")
+
+    monkeypatch.setattr(warmup, "_warmup_hooks", [slow_hook, later_hook])
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path}/shutdown.db")
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(main, "dispose_engines", lambda: events.append("engines disposed"))
+    database.dispose_engines()
+    try:
+        with TestClient(app):
+            assert started.wait(5)
+        assert events == ["slow hook finished", "engines disposed"]
+    finally:
+        database.dispose_engines()
+        change_feed.reset()
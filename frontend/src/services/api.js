@@ -1,8 +1,12 @@
 const API_BASE_URL = "http://localhost:8000/api";
 
+// Send and store cookies on these cross-origin calls. The backend uses a
+// cookie to route a client's reads to the primary right after it writes.
+const CREDENTIALS = "include";
+
 export const getGraphData = async () => {
   try {
-    const response = await fetch(`${API_BASE_URL}/graph`);
+    const response = await fetch(`${API_BASE_URL}/graph`, { credentials: CREDENTIALS });
     if (!response.ok) {
       throw new Error("Network response was not ok");
     }
@@ -18,6 +22,7 @@ export const addKeyword = async (keyword) => {
   try {
     const response = await fetch(`${API_BASE_URL}/add`, {
       method: "POST",
+      credentials: CREDENTIALS,
       headers: {
         "Content-Type": "application/json",
       },
@@ -36,7 +41,7 @@ export const addKeyword = async (keyword) => {
 
 export const exportNode = async (nodeId) => {
   try {
-    const response = await fetch(`${API_BASE_URL}/export/${nodeId}`);
+    const response = await fetch(`${API_BASE_URL}/export/${nodeId}`, { credentials: CREDENTIALS });
     if (!response.ok) {
       const errorData = await response.json();
       throw new Error(errorData.detail || "Failed to export node");
@@ -60,6 +65,7 @@ export const deleteNode = async (nodeId) => {
   try {
     const response = await fetch(`${API_BASE_URL}/nodes/${nodeId}`, {
       method: "DELETE",
+      credentials: CREDENTIALS,
     });
     if (!response.ok) {
       const errorData = await response.json();